@@ -4,13 +4,40 @@ Directions Doc Suggester Hook
 
 Parses user prompts for keywords and suggests relevant documentation.
 Runs on UserPromptSubmit to provide contextual doc recommendations.
+
+Performance notes: keyword matching is tiered. If hyperscan or
+pyahocorasick is installed the scan runs in their C extensions; the
+stdlib fallback is a single fused regex compiled on first use. A
+project-specific compiled matcher (Cython/C) was considered and
+rejected: hook scripts are copied into projects and run under whatever
+python3 is on the user's PATH, so they cannot carry a build step. The
+optional pip-installable extensions provide the native fast path
+without one.
 """
 
-import json
+import functools
 import os
-import re
 import sys
-from pathlib import Path
+
+try:
+    import orjson  # optional C serializer
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    import json
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj)
+
+
+# re, hashlib, and the optional C scanners are imported lazily: the
+# frequent exits (no prompt, non-Directions project, slash command)
+# never pay their import cost in a fork-per-prompt hook
+re = None
+hyperscan = None
+ahocorasick = None
 
 
 # Keyword to doc mapping
@@ -79,41 +106,326 @@ DOC_MAPPINGS = [
 ]
 
 
+# Characters that count as part of a word when verifying keyword boundaries
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789_")
+
+
+def _flatten_keywords() -> tuple[tuple[str, ...], bytes, bytes]:
+    """Flatten DOC_MAPPINGS into parallel keyword/index/boundary columns.
+
+    The matcher builders only ever need these three fields per keyword,
+    so they scan contiguous columns instead of walking the list-of-dicts;
+    the mapping dicts themselves are touched only after a hit. The index
+    and boundary columns are frozen as bytes - one byte per keyword in a
+    single memory block, rather than a tuple of boxed ints/bools.
+    """
+    keywords = []
+    indices = []
+    boundaries = []
+    for index, mapping in enumerate(DOC_MAPPINGS):
+        for keyword in mapping["keywords"]:
+            keywords.append(keyword.lower())
+            indices.append(index)
+            boundaries.append(len(keyword) <= 4)
+    return tuple(keywords), bytes(indices), bytes(boundaries)
+
+
+_ALL_KEYWORDS, _MAPPING_IDX, _NEEDS_BOUNDARY = _flatten_keywords()
+
+
+def _build_hs_database():
+    """Compile every keyword into one Hyperscan block-mode database.
+
+    Short keywords are wrapped in word boundaries before compilation;
+    SINGLEMATCH caps each expression at one report per scan.
+    """
+    expressions = []
+    for keyword, needs_boundary in zip(_ALL_KEYWORDS, _NEEDS_BOUNDARY):
+        pattern = re.escape(keyword)
+        if needs_boundary:
+            pattern = r"\b" + pattern + r"\b"
+        expressions.append(pattern.encode())
+
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(_MAPPING_IDX),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+    )
+    return database
+
+
+def _build_automaton():
+    """Build a single Aho-Corasick automaton over every keyword.
+
+    One linear pass over the prompt replaces the per-keyword scan.
+    Short keywords carry a flag so word boundaries can be verified
+    after the automaton reports a hit.
+    """
+    automaton = ahocorasick.Automaton()
+    for position, keyword in enumerate(_ALL_KEYWORDS):
+        automaton.add_word(keyword, (_MAPPING_IDX[position], keyword, _NEEDS_BOUNDARY[position]))
+    automaton.make_automaton()
+    return automaton
+
+
+def _trie_regex(words: list[str]) -> str:
+    """Compile words into a trie-compressed alternation, e.g. ban(?:ana|k).
+
+    Shared prefixes are factored out so the regex engine never backtracks
+    over them, instead of emitting a flat word1|word2|... alternation.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        if list(node) == [""]:
+            return ""
+        alternatives = []
+        optional = False
+        for char, child in sorted(node.items()):
+            if char == "":
+                optional = True
+            else:
+                alternatives.append(re.escape(char) + emit(child))
+        if len(alternatives) == 1 and not optional:
+            return alternatives[0]
+        body = "(?:" + "|".join(alternatives) + ")"
+        return body + "?" if optional else body
+
+    return emit(trie)
+
+
+def _build_alt(keywords: list[str]) -> str:
+    """Build the alternation pattern covering all of a mapping's keywords.
+
+    Short keywords (<= 4 chars) are boundary-guarded to avoid false
+    matches inside longer words; long keywords match as substrings,
+    mirroring the original per-keyword scan.
+    """
+    short = [k.lower() for k in keywords if len(k) <= 4]
+    long = [k.lower() for k in keywords if len(k) > 4]
+
+    parts = []
+    if short:
+        parts.append(r"\b(?:" + _trie_regex(short) + r")\b")
+    if long:
+        parts.append(_trie_regex(long))
+    return "|".join(parts)
+
+
+# Matcher state, built on first real scan by _init_matchers()
+_HS_DATABASE = None
+_AUTOMATON = None
+_FUSED = None
+_GROUP_TO_INDEX: dict[str, int] = {}
+_MATCHERS_READY = False
+
+
+def _init_matchers() -> None:
+    """Import the matching machinery and compile the matchers once.
+
+    Deferred from import time so invocations that exit early never pay
+    for loading re (sre compilation, unicode tables) or for pattern
+    compilation.
+    """
+    global re, hyperscan, ahocorasick
+    global _HS_DATABASE, _AUTOMATON, _FUSED, _GROUP_TO_INDEX, _MATCHERS_READY
+
+    import re
+
+    try:
+        import hyperscan  # optional SIMD multi-pattern scanner
+    except ImportError:
+        hyperscan = None
+
+    try:
+        import ahocorasick  # pyahocorasick - optional C-level fast path
+    except ImportError:
+        ahocorasick = None
+
+    try:
+        _HS_DATABASE = _build_hs_database() if hyperscan is not None else None
+    except Exception:
+        # A compile failure in the optional scanner must not break the hook
+        _HS_DATABASE = None
+
+    _AUTOMATON = _build_automaton() if ahocorasick is not None else None
+
+    # One fused regex over every mapping: each mapping is a named group
+    # m<i>, so one pass replaces the per-mapping loop and lastgroup
+    # identifies each hit's mapping. Alternation order only breaks ties
+    # between matches starting at the same offset; mapping priority is
+    # resolved in _scan_for_mapping by taking the lowest group index.
+    _FUSED = re.compile(
+        "|".join(
+            f"(?P<m{i}>{_build_alt(mapping['keywords'])})"
+            for i, mapping in enumerate(DOC_MAPPINGS)
+        ),
+        re.IGNORECASE,
+    )
+
+    # Resolve lastgroup names to mapping indices through a prebuilt table
+    # instead of parsing the digits out of "m<i>" on every hit
+    _GROUP_TO_INDEX = {f"m{i}": i for i in range(len(DOC_MAPPINGS))}
+
+    _MATCHERS_READY = True
+
+
 def find_project_root():
     """Find the project root from environment or cwd."""
     return os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
 
 
-def check_directions_exists(project_root: Path) -> bool:
+# Marker file relative to the project root, joined as a plain string so
+# the hot existence check allocates no PurePath objects
+_BASE_REL = "docs/00_base.md"
+
+# Existence results per project root, so repeated checks within one
+# process cost a dict lookup instead of a stat()
+_DIR_CACHE: dict[str, bool] = {}
+
+
+def check_directions_exists(project_root: str) -> bool:
     """Check if this is a Directions project."""
-    return (project_root / "docs" / "00_base.md").exists()
+    hit = _DIR_CACHE.get(project_root)
+    if hit is not None:
+        return hit
+    result = os.path.exists(os.path.join(project_root, _BASE_REL))
+    _DIR_CACHE[project_root] = result
+    return result
 
 
-def find_matching_doc(prompt: str) -> dict | None:
-    """Find a matching doc based on keywords in the prompt."""
+def _scan_for_mapping(prompt: str) -> int | None:
+    """Scan the prompt and return the index of the matching mapping."""
+    if not _MATCHERS_READY:
+        _init_matchers()
+
+    if _HS_DATABASE is not None:
+        # Hyperscan reports in end-offset order, so halting on the first
+        # report has the same embedded-keyword shadowing problem as the
+        # automaton tier. SINGLEMATCH already bounds the scan at one
+        # report per expression; collect them all and take the
+        # highest-priority mapping.
+        hits: list[int] = []
+
+        def _on_match(match_id, start, end, flags, context):
+            hits.append(match_id)
+
+        _HS_DATABASE.scan(prompt.encode("utf-8", "replace"), match_event_handler=_on_match)
+        return min(hits) if hits else None
+
     prompt_lower = prompt.lower()
 
-    for mapping in DOC_MAPPINGS:
-        for keyword in mapping["keywords"]:
-            # Use word boundaries for short keywords to avoid false matches
-            if len(keyword) <= 4:
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                if re.search(pattern, prompt_lower):
-                    return mapping
-            else:
-                if keyword in prompt_lower:
-                    return mapping
+    if _AUTOMATON is not None:
+        # The automaton yields hits in end-offset order, so returning the
+        # first one would let a keyword embedded in a longer keyword from
+        # a later mapping win (e.g. "publish" inside "published"). Finish
+        # the linear pass and resolve ties by mapping priority instead.
+        best = None
+        for end_idx, (index, keyword, needs_boundary) in _AUTOMATON.iter(prompt_lower):
+            if needs_boundary:
+                start = end_idx - len(keyword) + 1
+                before = prompt_lower[start - 1] if start > 0 else " "
+                after = prompt_lower[end_idx + 1] if end_idx + 1 < len(prompt_lower) else " "
+                if before in _WORD_CHARS or after in _WORD_CHARS:
+                    continue
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break  # nothing outranks the top-priority mapping
+        return best
 
-    return None
+    # Fallback for environments without pyahocorasick: one fused regex
+    # pass, with lastgroup identifying each hit's mapping. search()
+    # would return the leftmost hit, not the highest-priority one, so
+    # walk every hit and resolve by mapping index like the other tiers.
+    best = None
+    for match in _FUSED.finditer(prompt):
+        index = _GROUP_TO_INDEX[match.lastgroup]
+        if best is None or index < best:
+            best = index
+            if best == 0:
+                break  # nothing outranks the top-priority mapping
+    return best
+
+
+# No keyword can match a prompt shorter than the shortest keyword
+_MIN_KW_LEN = min(map(len, _ALL_KEYWORDS))
+
+# Prompts beyond this are truncated before scanning; a relevant keyword
+# that only appears after 64KB of text is not worth the scan time
+_MAX_SCAN_LEN = 1 << 16
+
+# Prompts longer than this are cached under a fixed-size digest so the
+# LRU keys stay small
+_CACHE_KEY_MAX = 4096
+
+_find_cached = functools.lru_cache(maxsize=512)(_scan_for_mapping)
+_digest_cache: dict[bytes, int | None] = {}
+
+
+def find_matching_doc(prompt: str) -> dict | None:
+    """Find a matching doc based on keywords in the prompt.
+
+    Results are memoized per prompt: repeated prompts in a session
+    (short edits, retries) short-circuit to a dict lookup with no
+    regex work at all.
+    """
+    # Slash commands and prompts shorter than any keyword can never
+    # match; exit before touching the cache or the matchers
+    stripped = prompt.strip()
+    if not stripped or stripped.startswith("/") or len(stripped) < _MIN_KW_LEN:
+        return None
+
+    if len(prompt) > _MAX_SCAN_LEN:
+        prompt = prompt[:_MAX_SCAN_LEN]
+
+    if len(prompt) <= _CACHE_KEY_MAX:
+        index = _find_cached(prompt)
+    else:
+        import hashlib
+
+        digest = hashlib.blake2b(prompt.encode("utf-8", "replace"), digest_size=16).digest()
+        if digest in _digest_cache:
+            index = _digest_cache[digest]
+        else:
+            index = _scan_for_mapping(prompt)
+            _digest_cache[digest] = index
+
+    return DOC_MAPPINGS[index] if index is not None else None
+
+
+def _emit(result: dict) -> None:
+    """Write the hook's JSON result to stdout."""
+    sys.stdout.write(_dumps(result))
+    sys.stdout.write("\n")
 
 
 def main():
     # Get the user's prompt from stdin or environment
     # Claude Code passes the prompt content via stdin for UserPromptSubmit hooks
-    prompt = ""
-
+    # Bounded reads straight from fd 0: no TextIOWrapper layer, capped
+    # at the 64KB the scanner would use. Loop to EOF - a single os.read
+    # returns only what is buffered in the pipe, and a parent writing
+    # the prompt in chunks would otherwise get it silently truncated.
+    chunks = []
     if not sys.stdin.isatty():
-        prompt = sys.stdin.read()
+        remaining = 1 << 16
+        try:
+            while remaining > 0:
+                chunk = os.read(0, remaining)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+        except OSError:
+            pass
+    prompt = b"".join(chunks).decode("utf-8", "replace") if chunks else ""
 
     # Also check environment variable as fallback
     if not prompt:
@@ -121,14 +433,12 @@ def main():
 
     if not prompt:
         # No prompt to analyze
-        print(json.dumps({}))
+        _emit({})
         return
 
-    project_root = Path(find_project_root())
-
     # Only suggest docs if this is a Directions project
-    if not check_directions_exists(project_root):
-        print(json.dumps({}))
+    if not check_directions_exists(find_project_root()):
+        _emit({})
         return
 
     # Find matching documentation
@@ -138,10 +448,10 @@ def main():
         result = {
             "message": f"📚 **Relevant doc:** `docs/{match['doc']}` covers {match['description']}."
         }
-        print(json.dumps(result))
+        _emit(result)
     else:
         # No match - return empty (no suggestion)
-        print(json.dumps({}))
+        _emit({})
 
 
 if __name__ == "__main__":
@@ -6,11 +6,31 @@ Checks if the current project uses Directions and loads context automatically.
 Returns a system message with project state for Claude to use.
 """
 
-import json
 import os
 import sys
 from pathlib import Path
-from datetime import datetime
+
+try:
+    import orjson  # optional C serializer
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    import json
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj)
+
+
+# Marker file relative to the project root, joined as a plain string so
+# the existence check allocates no PurePath objects
+_BASE_REL = "docs/00_base.md"
+
+# Prefix tuples use str.startswith's tuple fast path: one call checks
+# both the bold and the plain form of a heading
+_PHASE_PREFIXES = ("**Phase:**", "Phase:")
+_FOCUS_PREFIXES = ("**Focus:**", "Focus:")
 
 
 def find_project_root():
@@ -18,97 +38,211 @@ def find_project_root():
     return os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
 
 
-def read_file_safely(path: Path) -> str | None:
-    """Read file contents or return None if not found."""
+def _first_meaningful_line(path: Path, max_bytes: int = 4096) -> str | None:
+    """Return the first meaningful line of a file, reading at most ~max_bytes.
+
+    Skips headings, blanks, and very short lines. Bounds the read so a
+    large session log never gets pulled in whole just for its summary.
+    """
+    bytes_read = 0
     try:
-        return path.read_text(encoding="utf-8")
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                bytes_read += len(line)
+                stripped = line.strip()
+                if stripped and not stripped.startswith("#") and len(stripped) > 10:
+                    return stripped[:100] + "..." if len(stripped) > 100 else stripped
+                if bytes_read >= max_bytes:
+                    break
     except (FileNotFoundError, PermissionError):
-        return None
-
-
-def extract_current_phase(content: str) -> str | None:
-    """Extract current phase from PROJECT_STATE.md content."""
-    for line in content.split("\n"):
-        if line.startswith("**Phase:**") or line.startswith("Phase:"):
-            return line.split(":", 1)[1].strip().strip("*")
-        if "current phase" in line.lower():
-            return line.split(":", 1)[1].strip() if ":" in line else None
+        pass
     return None
 
 
-def extract_current_focus(content: str) -> str | None:
-    """Extract current focus from PROJECT_STATE.md content."""
-    for line in content.split("\n"):
-        if line.startswith("**Focus:**") or line.startswith("Focus:"):
-            return line.split(":", 1)[1].strip().strip("*")
-        if "current focus" in line.lower():
-            return line.split(":", 1)[1].strip() if ":" in line else None
-    return None
-
+def extract_state(path: Path) -> tuple[str | None, str | None, list[str]]:
+    """Extract phase, focus, and blockers from PROJECT_STATE.md.
 
-def extract_blockers(content: str) -> list[str]:
-    """Extract blockers from PROJECT_STATE.md content."""
-    blockers = []
+    Streams the file line by line and tracks all three fields in a
+    single pass, instead of reading the full text and splitting it
+    into a fresh line list once per field. Raises OSError if the file
+    cannot be read, so callers can tell an unreadable file apart from
+    one whose fields are simply absent.
+    """
+    phase = None
+    focus = None
+    blockers: list[str] = []
+    phase_found = False
+    focus_found = False
     in_blockers = False
-
-    for line in content.split("\n"):
-        if "blocker" in line.lower() and "#" in line:
-            in_blockers = True
-            continue
-        if in_blockers:
-            if line.startswith("#"):
-                break
-            if line.strip().startswith("-") or line.strip().startswith("*"):
-                blocker = line.strip().lstrip("-*").strip()
-                if blocker and blocker.lower() != "none":
-                    blockers.append(blocker)
-
-    return blockers
+    blockers_done = False
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+
+            if not phase_found and line.startswith(_PHASE_PREFIXES):
+                phase = line.split(":", 1)[1].strip().strip("*")
+                phase_found = True
+            elif not focus_found and line.startswith(_FOCUS_PREFIXES):
+                focus = line.split(":", 1)[1].strip().strip("*")
+                focus_found = True
+            elif (
+                (not phase_found or not focus_found)
+                and ":" in line
+                and line[:1].isalpha()
+            ):
+                # Lowercase only prose lines that could still match;
+                # headings, bullets, and blanks never reach here
+                lowered = line.lower()
+                if not phase_found and "current phase" in lowered:
+                    phase = line.split(":", 1)[1].strip()
+                    phase_found = True
+                if not focus_found and "current focus" in lowered:
+                    focus = line.split(":", 1)[1].strip()
+                    focus_found = True
+
+            if not blockers_done:
+                if line.startswith("#"):
+                    # Cheap heading test first; only headings pay
+                    # for the case-folded substring search
+                    if "blocker" in line.casefold():
+                        in_blockers = True
+                    elif in_blockers:
+                        in_blockers = False
+                        blockers_done = True
+                elif in_blockers and (line.strip().startswith("-") or line.strip().startswith("*")):
+                    blocker = line.strip().lstrip("-*").strip()
+                    if blocker and blocker.lower() != "none":
+                        blockers.append(blocker)
+
+    return phase, focus, blockers
 
 
 def get_latest_session(sessions_dir: Path) -> tuple[str | None, str | None]:
     """Get the most recent session log filename and summary."""
-    if not sessions_dir.exists():
+    # Session logs sort by name (YYYY-MM-DD.md), so a single running max
+    # over scandir replaces materializing and sorting the whole listing.
+    # No exists() probe first: just let scandir raise if the directory
+    # is missing or unreadable, saving a stat() on the happy path. Any
+    # OSError degrades to "no session", as the old glob did - a hook
+    # must emit JSON, not a traceback.
+    latest_name = None
+    try:
+        with os.scandir(sessions_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if (
+                    name.endswith(".md")
+                    and name != "_index.md"
+                    and (latest_name is None or name > latest_name)
+                ):
+                    latest_name = name
+    except OSError:
+        return None, None
+
+    if latest_name is None:
         return None, None
 
-    session_files = sorted(
-        [f for f in sessions_dir.glob("*.md") if f.name != "_index.md"],
-        reverse=True
+    # First meaningful line serves as the summary
+    summary = _first_meaningful_line(sessions_dir / latest_name)
+
+    return latest_name, summary
+
+
+# Shared-memory cache for the parsed PROJECT_STATE, keyed on the file's
+# (mtime_ns, size) so any rewrite invalidates it. Fixed-size segment:
+# a 20-byte header (mtime_ns, size, payload length) and a JSON payload.
+_STATE_CACHE_SIZE = 16384
+
+
+def _open_state_cache(create: bool):
+    """Attach to (or create) the per-user state cache segment."""
+    from multiprocessing import resource_tracker, shared_memory
+
+    shm = shared_memory.SharedMemory(
+        name=f"directions-state-{os.getuid()}",
+        create=create,
+        size=_STATE_CACHE_SIZE if create else 0,
     )
+    # The segment must outlive this short-lived process; keep the
+    # resource tracker from unlinking it (with a warning) at exit
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
 
-    if not session_files:
-        return None, None
 
-    latest = session_files[0]
-    content = read_file_safely(latest)
+def _read_cached_state(stat: os.stat_result) -> tuple | None:
+    """Return the cached (phase, focus, blockers) if still current."""
+    import struct
+
+    try:
+        shm = _open_state_cache(create=False)
+    except Exception:
+        return None
+    try:
+        mtime_ns, size, length = struct.unpack_from("<QQI", shm.buf, 0)
+        if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+            return None
+        import json
+
+        phase, focus, blockers = json.loads(bytes(shm.buf[20:20 + length]))
+        return phase, focus, blockers
+    except Exception:
+        return None
+    finally:
+        shm.close()
+
 
-    # Try to extract first meaningful line as summary
-    summary = None
-    if content:
-        for line in content.split("\n"):
-            line = line.strip()
-            if line and not line.startswith("#") and len(line) > 10:
-                summary = line[:100] + "..." if len(line) > 100 else line
-                break
+def _write_cached_state(stat: os.stat_result, state: tuple) -> None:
+    """Store the parsed state for the next invocation; best effort."""
+    import json
+    import struct
 
-    return latest.name, summary
+    payload = json.dumps(state).encode()
+    if len(payload) + 20 > _STATE_CACHE_SIZE:
+        return
+    try:
+        try:
+            shm = _open_state_cache(create=True)
+        except FileExistsError:
+            shm = _open_state_cache(create=False)
+        try:
+            struct.pack_into("<QQI", shm.buf, 0, stat.st_mtime_ns, stat.st_size, len(payload))
+            shm.buf[20:20 + len(payload)] = payload
+        finally:
+            shm.close()
+    except Exception:
+        pass
 
 
 def build_context_message(project_root: Path) -> dict:
     """Build the context message for a Directions project."""
     docs_dir = project_root / "docs"
 
-    # Read PROJECT_STATE.md
-    state_content = read_file_safely(docs_dir / "PROJECT_STATE.md")
-
-    phase = None
-    focus = None
-    blockers = []
-
-    if state_content:
-        phase = extract_current_phase(state_content)
-        focus = extract_current_focus(state_content)
-        blockers = extract_blockers(state_content)
+    # Read PROJECT_STATE.md, skipping the parse entirely when the
+    # shared-memory cache still matches the file's stat identity
+    state_path = docs_dir / "PROJECT_STATE.md"
+    try:
+        state_stat = os.stat(state_path)
+    except OSError:
+        state_stat = None
+
+    state = _read_cached_state(state_stat) if state_stat is not None else None
+    if state is None:
+        try:
+            state = extract_state(state_path)
+        except OSError:
+            # Unreadable file: fall back to empty state but never cache
+            # it - a later chmod changes neither mtime nor size, so a
+            # cached failure would otherwise stick until the next edit
+            state = (None, None, [])
+        else:
+            if state_stat is not None:
+                _write_cached_state(state_stat, state)
+
+    phase, focus, blockers = state
 
     # Get latest session
     latest_session, session_summary = get_latest_session(docs_dir / "sessions")
@@ -146,16 +280,16 @@ def build_non_directions_message() -> dict:
 
 
 def main():
-    project_root = Path(find_project_root())
-    docs_base = project_root / "docs" / "00_base.md"
+    project_root = find_project_root()
 
-    if docs_base.exists():
-        result = build_context_message(project_root)
+    if os.path.exists(os.path.join(project_root, _BASE_REL)):
+        result = build_context_message(Path(project_root))
     else:
         result = build_non_directions_message()
 
     # Output JSON for Claude to consume
-    print(json.dumps(result))
+    sys.stdout.write(_dumps(result))
+    sys.stdout.write("\n")
 
 
 if __name__ == "__main__":